@@ -1,6 +1,6 @@
 from flask import Flask, request, render_template, jsonify
 from Programming_Language_Making.ai_helper import generate_ai_explanation
-from Programming_Language_Making.project_lexer_and_parser import main
+from Programming_Language_Making.project_lexer_and_parser import main, MODE_NORMAL
 
 app = Flask(__name__)
 
@@ -13,7 +13,8 @@ def index():
 @app.route('/jakk', methods=['POST'])
 def jakk():
     input_code = request.form.get('input_code')
-    console_output, final_result = main(input_code)
+    mode = request.form.get('mode', MODE_NORMAL)
+    console_output, final_result = main(input_code, mode)
 
     ai_explanation = generate_ai_explanation(console_output)
 
@@ -0,0 +1,38 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ARG DOT LAMBDA LPAREN RPAREN VARexpr : termexpr : applicationexpr : abstractionterm : VARterm : ARGterm : LPAREN expr RPARENapplication : expr termabstraction : LAMBDA VAR DOT expr'
+    
+_lr_action_items = {'VAR':([0,1,2,3,4,5,6,7,8,9,10,12,13,14,],[5,5,-1,-2,-3,-4,-5,5,11,-7,5,-6,5,5,]),'ARG':([0,1,2,3,4,5,6,7,9,10,12,13,14,],[6,6,-1,-2,-3,-4,-5,6,-7,6,-6,6,6,]),'LPAREN':([0,1,2,3,4,5,6,7,9,10,12,13,14,],[7,7,-1,-2,-3,-4,-5,7,-7,7,-6,7,7,]),'LAMBDA':([0,7,13,],[8,8,8,]),'$end':([1,2,3,4,5,6,9,12,14,],[0,-1,-2,-3,-4,-5,-7,-6,-8,]),'RPAREN':([2,3,4,5,6,9,10,12,14,],[-1,-2,-3,-4,-5,-7,12,-6,-8,]),'DOT':([11,],[13,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expr':([0,7,13,],[1,10,14,]),'term':([0,1,7,10,13,14,],[2,9,2,9,2,9,]),'application':([0,7,13,],[3,3,3,]),'abstraction':([0,7,13,],[4,4,4,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expr","S'",1,None,None,None),
+  ('expr -> term','expr',1,'p_expr_term','project_lexer_and_parser.py',127),
+  ('expr -> application','expr',1,'p_expr_application','project_lexer_and_parser.py',132),
+  ('expr -> abstraction','expr',1,'p_expr_abstraction','project_lexer_and_parser.py',137),
+  ('term -> VAR','term',1,'p_term_var','project_lexer_and_parser.py',142),
+  ('term -> ARG','term',1,'p_term_arg','project_lexer_and_parser.py',147),
+  ('term -> LPAREN expr RPAREN','term',3,'p_term_paren','project_lexer_and_parser.py',152),
+  ('application -> expr term','application',2,'p_application','project_lexer_and_parser.py',157),
+  ('abstraction -> LAMBDA VAR DOT expr','abstraction',4,'p_abstraction','project_lexer_and_parser.py',162),
+]
@@ -0,0 +1,340 @@
+import string
+
+from Programming_Language_Making.project_lexer_and_parser import VarNode, ArgNode, AppNode, AbsNode, \
+    FRAME_FUNC, FRAME_ARG, FRAME_BODY
+
+#############################
+# DE BRUIJN TERMS
+#############################
+
+# Compact, nameless representation of the AST. Bound variables are stored as the
+# number of binders between the occurrence and its abstraction, so alpha-equivalent
+# expressions have identical structure. Binders keep the user's name as a hint that
+# is only used when converting back for printing.
+
+
+# Bound variable, index 0 refers to the nearest enclosing abstraction
+class DBVar:
+    __slots__ = ('index', 'hash')
+
+    def __init__(self, index):
+        self.index = index
+        self.hash = hash(('var', index))
+
+    def __eq__(self, other):
+        return alpha_equivalent_db(self, other)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return repr(from_debruijn(self))
+
+
+# Free variable, kept by name since it has no binder to point to
+class DBFree:
+    __slots__ = ('name', 'hash')
+
+    def __init__(self, name):
+        self.name = name
+        self.hash = hash(('free', name))
+
+    def __eq__(self, other):
+        return alpha_equivalent_db(self, other)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return repr(from_debruijn(self))
+
+
+# Numeric argument literal
+class DBArg:
+    __slots__ = ('value', 'hash')
+
+    def __init__(self, value):
+        self.value = value
+        self.hash = hash(('arg', value))
+
+    def __eq__(self, other):
+        return alpha_equivalent_db(self, other)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return repr(from_debruijn(self))
+
+
+# Function Application
+class DBApp:
+    __slots__ = ('func', 'arg', 'hash')
+
+    def __init__(self, func, arg):
+        self.func = func
+        self.arg = arg
+        self.hash = hash(('app', func.hash, arg.hash))
+
+    def __eq__(self, other):
+        return alpha_equivalent_db(self, other)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return repr(from_debruijn(self))
+
+
+# Function Abstraction, the name hint does not take part in equality or hashing
+class DBAbs:
+    __slots__ = ('body', 'hint', 'hash')
+
+    def __init__(self, body, hint):
+        self.body = body
+        self.hint = hint
+        self.hash = hash(('abs', body.hash))
+
+    def __eq__(self, other):
+        return alpha_equivalent_db(self, other)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return repr(from_debruijn(self))
+
+
+#############################
+# CONVERSION
+#############################
+
+# Function to convert a named AST into its de Bruijn representation
+def to_debruijn(expr, bound=None):
+    if bound is None:
+        bound = []
+    if isinstance(expr, VarNode):
+        # Search from the innermost binder outwards
+        for depth in range(len(bound) - 1, -1, -1):
+            if bound[depth] == expr.name:
+                return DBVar(len(bound) - 1 - depth)
+        return DBFree(expr.name)
+    elif isinstance(expr, AbsNode):
+        bound.append(expr.var)
+        body = to_debruijn(expr.body, bound)
+        bound.pop()
+        return DBAbs(body, expr.var)
+    elif isinstance(expr, AppNode):
+        return DBApp(to_debruijn(expr.func, bound), to_debruijn(expr.arg, bound))
+    elif isinstance(expr, ArgNode):
+        return DBArg(expr.value)
+    else:
+        raise TypeError(f"\nUnexpected expression type: {type(expr)}")
+
+
+# Function to collect the free names and loose indices of a term, memoized per node
+def _loose(term, memo):
+    key = id(term)
+    if key in memo:
+        return memo[key]
+    if isinstance(term, DBVar):
+        result = (frozenset(), frozenset({term.index}))
+    elif isinstance(term, DBFree):
+        result = (frozenset({term.name}), frozenset())
+    elif isinstance(term, DBApp):
+        func_names, func_indices = _loose(term.func, memo)
+        arg_names, arg_indices = _loose(term.arg, memo)
+        result = (func_names | arg_names, func_indices | arg_indices)
+    elif isinstance(term, DBAbs):
+        names, indices = _loose(term.body, memo)
+        result = (names, frozenset(i - 1 for i in indices if i > 0))
+    elif isinstance(term, DBArg):
+        result = (frozenset(), frozenset())
+    else:
+        raise TypeError(f"\nUnexpected term type: {type(term)}")
+    memo[key] = result
+    return result
+
+
+# Function to pick a printable name for a binder whose hint would capture a variable
+def _fresh_name(hint, taken):
+    for name in string.ascii_lowercase:
+        if name not in taken:
+            return name
+    suffix = 1
+    while f"{hint}{suffix}" in taken:
+        suffix += 1
+    return f"{hint}{suffix}"
+
+
+# Function to convert a de Bruijn term back into a named AST, reusing the
+# original binder names unless that would capture another variable
+def from_debruijn(term, names=None, memo=None):
+    if names is None:
+        names = []
+    if memo is None:
+        memo = {}
+    if isinstance(term, DBVar):
+        if term.index >= len(names):
+            raise ValueError(f"Loose de Bruijn index {term.index} has no binder")
+        return VarNode(names[-1 - term.index])
+    elif isinstance(term, DBFree):
+        return VarNode(term.name)
+    elif isinstance(term, DBAbs):
+        free_names, indices = _loose(term.body, memo)
+        # Names the body still refers to, other than through this binder
+        visible = set(free_names)
+        visible.update(names[-i] for i in indices if 0 < i <= len(names))
+        name = term.hint
+        if name in visible:
+            name = _fresh_name(term.hint, visible | set(names))
+        names.append(name)
+        body = from_debruijn(term.body, names, memo)
+        names.pop()
+        return AbsNode(name, body)
+    elif isinstance(term, DBApp):
+        return AppNode(from_debruijn(term.func, names, memo), from_debruijn(term.arg, names, memo))
+    elif isinstance(term, DBArg):
+        return ArgNode(term.value)
+    else:
+        raise TypeError(f"\nUnexpected term type: {type(term)}")
+
+
+#############################
+# ALPHA EQUIVALENCE
+#############################
+
+# Function to compare two de Bruijn terms structurally, which is alpha-equivalence
+# for the named expressions they were built from
+def alpha_equivalent_db(left, right):
+    stack = [(left, right)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        if type(a) is not type(b) or a.hash != b.hash:
+            return False
+        if isinstance(a, DBVar):
+            if a.index != b.index:
+                return False
+        elif isinstance(a, DBFree):
+            if a.name != b.name:
+                return False
+        elif isinstance(a, DBArg):
+            if a.value != b.value:
+                return False
+        elif isinstance(a, DBAbs):
+            stack.append((a.body, b.body))
+        else:
+            stack.append((a.arg, b.arg))
+            stack.append((a.func, b.func))
+    return True
+
+
+# Function to check whether two named expressions only differ in bound variable names
+def alpha_equivalent(left, right):
+    return alpha_equivalent_db(to_debruijn(left), to_debruijn(right))
+
+
+#############################
+# SUBSTITUTION
+#############################
+
+# Function to add d to every index that points outside the innermost cutoff binders
+def shift(term, d, cutoff=0):
+    if isinstance(term, DBVar):
+        return DBVar(term.index + d) if term.index >= cutoff else term
+    elif isinstance(term, DBAbs):
+        body = shift(term.body, d, cutoff + 1)
+        return term if body is term.body else DBAbs(body, term.hint)
+    elif isinstance(term, DBApp):
+        func = shift(term.func, d, cutoff)
+        arg = shift(term.arg, d, cutoff)
+        return term if func is term.func and arg is term.arg else DBApp(func, arg)
+    elif isinstance(term, (DBFree, DBArg)):
+        return term
+    else:
+        raise TypeError(f"\nUnexpected term type: {type(term)}")
+
+
+# Function to replace the variable with index j by the replacement term. No capture
+# check is needed, the replacement is shifted as it moves under binders.
+def substitute_db(term, j, replacement):
+    if isinstance(term, DBVar):
+        return replacement if term.index == j else term
+    elif isinstance(term, DBAbs):
+        body = substitute_db(term.body, j + 1, shift(replacement, 1))
+        return term if body is term.body else DBAbs(body, term.hint)
+    elif isinstance(term, DBApp):
+        func = substitute_db(term.func, j, replacement)
+        arg = substitute_db(term.arg, j, replacement)
+        return term if func is term.func and arg is term.arg else DBApp(func, arg)
+    elif isinstance(term, (DBFree, DBArg)):
+        return term
+    else:
+        raise TypeError(f"\nUnexpected term type: {type(term)}")
+
+
+# Function to contract the redex (# . body) arg
+def beta_db(body, arg):
+    return shift(substitute_db(body, 0, shift(arg, 1)), -1)
+
+
+#############################
+# REDUCTION
+#############################
+
+# Function to perform eta reduction on the whole term, (# . f 0) -> f when f does not use 0
+def eta_reduce_db(term):
+    if isinstance(term, DBAbs) and isinstance(term.body, DBApp):
+        arg = term.body.arg
+        if isinstance(arg, DBVar) and arg.index == 0 and 0 not in _loose(term.body.func, {})[1]:
+            return shift(term.body.func, -1), True
+    return term, False
+
+
+# Function to reduce a term to normal form in leftmost-outermost order. Indices are
+# relative to their binders, so contracting under an abstraction never needs the
+# surrounding context to be adjusted.
+def normalize_db(term):
+    stack = []  # (is function position, node, other child)
+    while True:
+        if isinstance(term, DBApp) and isinstance(term.func, DBAbs):
+            term = beta_db(term.func.body, term.arg)
+            if isinstance(term, DBAbs) and stack and stack[-1][0] == FRAME_FUNC:
+                term = DBApp(term, stack.pop()[2])
+            continue
+        if isinstance(term, DBApp):
+            stack.append((FRAME_FUNC, term, term.arg))
+            term = term.func
+            continue
+        if isinstance(term, DBAbs):
+            stack.append((FRAME_BODY, term, term.hint))
+            term = term.body
+            continue
+        if not isinstance(term, (DBVar, DBFree, DBArg)):
+            raise TypeError(f"\nUnexpected term type: {type(term)}")
+
+        while stack:
+            kind, original, other = stack.pop()
+            if kind == FRAME_FUNC:
+                stack.append((FRAME_ARG, original, term))
+                term = other
+                break
+            elif kind == FRAME_ARG:
+                if other is not original.func or term is not original.arg:
+                    term = DBApp(other, term)
+                else:
+                    term = original
+            else:
+                term = original if term is original.body else DBAbs(term, other)
+        else:
+            term, changed = eta_reduce_db(term)
+            if not changed:
+                return term
+
+
+# Function to reduce a named expression to normal form through the de Bruijn
+# representation and convert the result back for printing
+def normalize_debruijn(expr):
+    return from_debruijn(normalize_db(to_debruijn(expr)))
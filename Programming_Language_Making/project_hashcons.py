@@ -0,0 +1,291 @@
+import string
+import weakref
+
+from Programming_Language_Making.project_lexer_and_parser import VarNode, ArgNode, AppNode, AbsNode, \
+    FRAME_FUNC, FRAME_ARG, FRAME_BODY, plug
+
+#############################
+# HASH-CONSED NODES
+#############################
+
+# The nodes below are the AST node classes with their hash, size and free variables
+# computed once at construction. A TermFactory hands out a single shared node for
+# every distinct subterm, so a term is stored as a DAG and identical subterms can be
+# compared by identity. The free variable sets follow free_vars in the interpreter,
+# so they can be used anywhere free_vars(expr) was.
+
+
+class HVarNode(VarNode):
+    __slots__ = ('hash', 'size', 'free', '__weakref__')
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.hash = hash(('var', name))
+        self.size = 1
+        self.free = frozenset((name,))
+
+    def __hash__(self):
+        return self.hash
+
+
+class HArgNode(ArgNode):
+    __slots__ = ('hash', 'size', 'free', '__weakref__')
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.hash = hash(('arg', value))
+        self.size = 1
+        self.free = frozenset()
+
+    def __hash__(self):
+        return self.hash
+
+
+class HAppNode(AppNode):
+    __slots__ = ('hash', 'size', 'free', '__weakref__')
+
+    def __init__(self, func, arg):
+        super().__init__(func, arg)
+        self.hash = hash(('app', func.hash, arg.hash))
+        self.size = 1 + func.size + arg.size
+        # Reuse a child's set when it already covers the other one
+        if arg.free <= func.free:
+            self.free = func.free
+        elif func.free <= arg.free:
+            self.free = arg.free
+        else:
+            self.free = func.free | arg.free
+
+    def __hash__(self):
+        return self.hash
+
+
+class HAbsNode(AbsNode):
+    __slots__ = ('hash', 'size', 'free', '__weakref__')
+
+    def __init__(self, var, body):
+        super().__init__(var, body)
+        self.hash = hash(('abs', var, body.hash))
+        self.size = 1 + body.size
+        # Same rule as free_vars: an unused head variable is reported as free
+        if var in body.free:
+            self.free = body.free - {var}
+        else:
+            self.free = body.free | {var}
+
+    def __hash__(self):
+        return self.hash
+
+
+#############################
+# TERM FACTORY
+#############################
+
+class TermFactory:
+    def __init__(self):
+        # Nodes are only kept alive by the terms that use them
+        self.table = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.table)
+
+    def _lookup(self, key, build):
+        node = self.table.get(key)
+        if node is None:
+            node = build()
+            self.table[key] = node
+        return node
+
+    def var(self, name):
+        return self._lookup(('var', name), lambda: HVarNode(name))
+
+    def arg(self, value):
+        return self._lookup(('arg', value), lambda: HArgNode(value))
+
+    def app(self, func, arg):
+        # Children are already shared, so they are part of the key by identity
+        return self._lookup(('app', func, arg), lambda: HAppNode(func, arg))
+
+    def abs(self, var, body):
+        return self._lookup(('abs', var, body), lambda: HAbsNode(var, body))
+
+    # Function to convert any AST into the shared DAG built by this factory
+    def intern(self, expr, memo=None):
+        if memo is None:
+            memo = {}
+        key = id(expr)
+        if key in memo:
+            return memo[key]
+        if isinstance(expr, (HVarNode, HArgNode, HAppNode, HAbsNode)) and self.table.get(
+                _key_of(expr)) is expr:
+            node = expr
+        elif isinstance(expr, VarNode):
+            node = self.var(expr.name)
+        elif isinstance(expr, ArgNode):
+            node = self.arg(expr.value)
+        elif isinstance(expr, AppNode):
+            node = self.app(self.intern(expr.func, memo), self.intern(expr.arg, memo))
+        elif isinstance(expr, AbsNode):
+            node = self.abs(expr.var, self.intern(expr.body, memo))
+        else:
+            raise TypeError(f"\nUnexpected expression type: {type(expr)}")
+        memo[key] = node
+        return node
+
+    # Function to rename the bound variable old_var to new_var in a body
+    def rename(self, expr, old_var, new_var):
+        if old_var not in expr.free:
+            return expr
+        if isinstance(expr, VarNode):
+            return self.var(new_var)
+        elif isinstance(expr, AbsNode):
+            if expr.var == old_var:
+                return expr
+            return self.abs(expr.var, self.rename(expr.body, old_var, new_var))
+        elif isinstance(expr, AppNode):
+            return self.app(self.rename(expr.func, old_var, new_var),
+                            self.rename(expr.arg, old_var, new_var))
+        return expr
+
+    # Function to substitute a variable in an expression with another expression,
+    # avoiding capture. Subterms without a free occurrence of var are returned as is.
+    def substitute(self, var, expr, replacement, trace=False):
+        if var not in expr.free:
+            return expr
+        if isinstance(expr, VarNode):
+            return replacement if expr.name == var else expr
+        elif isinstance(expr, AbsNode):
+            if expr.var == var:
+                return expr
+            if expr.var in replacement.free:
+                new_var = fresh_var(expr.var, replacement.free | expr.body.free | {var})
+                if trace:
+                    print(f"\nAlpha Substitution: Renaming {expr.var} to {new_var}")
+                body = self.rename(expr.body, expr.var, new_var)
+                return self.abs(new_var, self.substitute(var, body, replacement, trace))
+            return self.abs(expr.var, self.substitute(var, expr.body, replacement, trace))
+        elif isinstance(expr, AppNode):
+            return self.app(self.substitute(var, expr.func, replacement, trace),
+                            self.substitute(var, expr.arg, replacement, trace))
+        return expr
+
+    # Function to check for eta reduction
+    def eta_reduce(self, expr, trace=False):
+        if isinstance(expr, AbsNode) and isinstance(expr.body, AppNode):
+            if isinstance(expr.body.arg, VarNode) and expr.body.arg.name == expr.var:
+                if expr.var not in expr.body.func.free:
+                    if trace:
+                        print(f"\nEta Reduction: Reducing {expr}")
+                    return expr.body.func, True
+        return expr, False
+
+    # Function to reduce an expression to its normal form in leftmost-outermost
+    # order, building every intermediate term from shared nodes
+    def normalize(self, expr, trace=False):
+        stack = []
+        focus = self.intern(expr)
+
+        while True:
+            if isinstance(focus, AppNode) and isinstance(focus.func, AbsNode):
+                if trace:
+                    print(f"\nBeta Reduction: Applying {focus.arg} to {focus.func}")
+                focus = self.substitute(focus.func.var, focus.func.body, focus.arg, trace)
+                if trace:
+                    print("\nReduced to:", plug(focus, stack))
+                if isinstance(focus, AbsNode) and stack and stack[-1][0] == FRAME_FUNC:
+                    focus = self.app(focus, stack.pop()[2])
+                continue
+
+            if isinstance(focus, AppNode):
+                stack.append((FRAME_FUNC, focus, focus.arg))
+                focus = focus.func
+                continue
+
+            if isinstance(focus, AbsNode):
+                stack.append((FRAME_BODY, focus, focus.var))
+                focus = focus.body
+                continue
+
+            while stack:
+                kind, original, other = stack.pop()
+                if kind == FRAME_FUNC:
+                    stack.append((FRAME_ARG, original, focus))
+                    focus = other
+                    break
+                elif kind == FRAME_ARG:
+                    focus = self.app(other, focus)
+                else:
+                    focus = self.abs(other, focus)
+            else:
+                reduced, changed = self.eta_reduce(focus, trace)
+                if not changed:
+                    return focus
+                focus = reduced
+                if trace:
+                    print("\nReduced to:", focus)
+
+
+# Function to build the factory table key of a shared node
+def _key_of(node):
+    if isinstance(node, VarNode):
+        return 'var', node.name
+    elif isinstance(node, ArgNode):
+        return 'arg', node.value
+    elif isinstance(node, AppNode):
+        return 'app', node.func, node.arg
+    return 'abs', node.var, node.body
+
+
+#############################
+# ANALYSIS
+#############################
+
+# Function to get free variables in a shared expression, in constant time
+def free_vars(expr):
+    return expr.free
+
+
+# Function to get bound variables in a shared expression, visiting each distinct
+# subterm once
+def bound_vars(expr):
+    bound = set()
+    seen = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, AbsNode):
+            if node.var in node.body.free:
+                bound.add(node.var)
+            stack.append(node.body)
+        elif isinstance(node, AppNode):
+            stack.append(node.arg)
+            stack.append(node.func)
+    return bound
+
+
+# Function to count the number of distinct nodes in a shared expression
+def dag_size(expr):
+    seen = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, AbsNode):
+            stack.append(node.body)
+        elif isinstance(node, AppNode):
+            stack.append(node.arg)
+            stack.append(node.func)
+    return len(seen)
+
+
+# Function to pick the first variable name that is not in use, deterministically
+def fresh_var(old_var, used_vars):
+    for name in string.ascii_lowercase:
+        if name != old_var and name not in used_vars:
+            return name
+    raise ValueError("No available variables for alpha conversion.")
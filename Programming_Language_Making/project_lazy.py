@@ -0,0 +1,245 @@
+import string
+
+from Programming_Language_Making.project_lexer_and_parser import VarNode, ArgNode, AppNode, AbsNode, \
+    free_vars, eta_reduce
+
+#############################
+# CALL-BY-NEED VALUES
+#############################
+
+# Call-by-need evaluation does not substitute arguments into the body. Each argument
+# becomes a thunk that is shared by every occurrence of the bound variable and is
+# updated with its value the first time it is needed, so it is reduced at most once.
+
+
+# Suspended argument, expr and env describe how to compute the value
+class Thunk:
+    __slots__ = ('expr', 'env', 'value')
+
+    def __init__(self, expr, env, value=None):
+        self.expr = expr
+        self.env = env
+        self.value = value
+
+
+# Abstraction together with the environment it was evaluated in
+class Closure:
+    __slots__ = ('var', 'body', 'env')
+
+    def __init__(self, var, body, env):
+        self.var = var
+        self.body = body
+        self.env = env
+
+
+# Free variable or argument literal applied to zero or more argument thunks
+class Neutral:
+    __slots__ = ('head', 'args')
+
+    def __init__(self, head, args):
+        self.head = head
+        self.args = args
+
+
+# Stack frames of the machine
+FRAME_APPLY = 'apply'  # argument thunk waiting for a function
+FRAME_UPDATE = 'update'  # thunk to overwrite with the value being returned
+
+# Read back tasks
+TASK_READ = 'read'
+TASK_FORCE = 'force'
+TASK_ABS = 'abs'
+TASK_APP = 'app'
+
+
+# Function to find the thunk bound to a name in a linked environment (name, thunk, parent)
+def lookup(env, name):
+    while env is not None:
+        if env[0] == name:
+            return env[1]
+        env = env[2]
+    return None
+
+
+# Function to pick a binder name for read back that does not capture a name in use
+def fresh_name(hint, in_use):
+    for name in string.ascii_lowercase:
+        if name not in in_use:
+            return name
+    suffix = 1
+    while f"{hint}{suffix}" in in_use:
+        suffix += 1
+    return f"{hint}{suffix}"
+
+
+#############################
+# EVALUATOR
+#############################
+
+class LazyEvaluator:
+    def __init__(self, trace=False, budget=None):
+        self.trace = trace
+        self.budget = budget
+        self.expr = None  # expression being normalized, the partial result if the budget runs out
+        self.beta_steps = 0
+        self.thunks_forced = 0
+        self.thunks_shared = 0
+        # Normal forms already read back with their sizes, so a shared value is normalized only once
+        self.normal_forms = {}
+
+    # Function to evaluate an expression in an environment to weak head normal form
+    def whnf(self, expr, env):
+        stack = []
+        while True:
+            if isinstance(expr, VarNode):
+                thunk = lookup(env, expr.name)
+                if thunk is None:
+                    value = Neutral(expr, ())
+                elif thunk.value is not None:
+                    self.thunks_shared += 1
+                    value = thunk.value
+                else:
+                    self.thunks_forced += 1
+                    stack.append((FRAME_UPDATE, thunk))
+                    expr, env = thunk.expr, thunk.env
+                    continue
+            elif isinstance(expr, AppNode):
+                stack.append((FRAME_APPLY, self._delay(expr.arg, env)))
+                self._grow(1)
+                expr = expr.func
+                continue
+            elif isinstance(expr, AbsNode):
+                value = Closure(expr.var, expr.body, env)
+            elif isinstance(expr, ArgNode):
+                value = Neutral(expr, ())
+            else:
+                raise TypeError(f"\nUnexpected expression type: {type(expr)}")
+
+            # Return the value to the frames waiting for it
+            while stack:
+                kind, thunk = stack[-1]
+                if kind == FRAME_UPDATE:
+                    stack.pop()
+                    thunk.value = value
+                    thunk.env = None
+                elif isinstance(value, Closure):
+                    if self.budget is not None:
+                        self.budget.step(self._partial)
+                    stack.pop()
+                    self._grow(-1)
+                    self.beta_steps += 1
+                    if self.trace:
+                        print(f"\nBeta Reduction: Applying {thunk.expr} to (# {value.var} . {value.body})")
+                    expr, env = value.body, (value.var, thunk, value.env)
+                    break
+                else:
+                    args = list(value.args)
+                    while stack and stack[-1][0] == FRAME_APPLY:
+                        args.append(stack.pop()[1])
+                    self._grow(len(value.args) - len(args))
+                    value = Neutral(value.head, tuple(args))
+            else:
+                return value
+
+    # Function to get the partial result, no intermediate expressions exist without substitution
+    def _partial(self):
+        return self.expr
+
+    # Function to build the thunk for an argument, variables reuse the thunk they are bound to
+    def _delay(self, expr, env):
+        if isinstance(expr, VarNode):
+            thunk = lookup(env, expr.name)
+            if thunk is not None:
+                return thunk
+            return Thunk(expr, None, Neutral(expr, ()))
+        elif isinstance(expr, ArgNode):
+            return Thunk(expr, None, Neutral(expr, ()))
+        return Thunk(expr, env)
+
+    # Function to get the value of a thunk, evaluating it on first use
+    def force(self, thunk):
+        if thunk.value is not None:
+            self.thunks_shared += 1
+            return thunk.value
+        self.thunks_forced += 1
+        thunk.value = self.whnf(thunk.expr, thunk.env)
+        thunk.env = None
+        return thunk.value
+
+    # Function to reduce an expression to normal form by evaluating to weak head
+    # normal form and reading the value back, continuing under abstractions
+    def normal_form(self, expr):
+        self.expr = expr
+        in_use = set(free_vars(expr))
+        results = []
+        tasks = [(TASK_READ, self.whnf(expr, None))]
+
+        while tasks:
+            task = tasks.pop()
+            kind = task[0]
+            if kind == TASK_FORCE:
+                tasks.append((TASK_READ, self.force(task[1])))
+            elif kind == TASK_READ:
+                value = task[1]
+                if value in self.normal_forms:
+                    node, size = self.normal_forms[value]
+                    self._grow(size)
+                    results.append((node, size))
+                elif isinstance(value, Closure):
+                    name = value.var if value.var not in in_use else fresh_name(value.var, in_use)
+                    in_use.add(name)
+                    tasks.append((TASK_ABS, value, name))
+                    placeholder = VarNode(name)
+                    env = (value.var, Thunk(placeholder, None, Neutral(placeholder, ())), value.env)
+                    tasks.append((TASK_READ, self.whnf(value.body, env)))
+                else:
+                    tasks.append((TASK_APP, value))
+                    for thunk in reversed(value.args):
+                        tasks.append((TASK_FORCE, thunk))
+            elif kind == TASK_ABS:
+                _, value, name = task
+                in_use.discard(name)
+                body, size = results.pop()
+                self._grow(1)
+                self.normal_forms[value] = (AbsNode(name, body), size + 1)
+                results.append(self.normal_forms[value])
+            else:
+                value = task[1]
+                count = len(value.args)
+                node, size = value.head, 1
+                if count:
+                    for arg, arg_size in results[-count:]:
+                        node = AppNode(node, arg)
+                        size += arg_size + 1
+                    del results[-count:]
+                self._grow(count + 1)
+                self.normal_forms[value] = (node, size)
+                results.append(self.normal_forms[value])
+
+        return results.pop()[0]
+
+    # Function to account for pending arguments on the machine stack and for nodes
+    # added to the normal form being read back
+    def _grow(self, nodes):
+        if self.budget is not None:
+            self.budget.resize(nodes, self._partial)
+
+
+# Function to reduce an expression to normal form with call-by-need evaluation,
+# followed by the same eta reduction of the whole expression as normalize
+def normalize_by_need(expr, trace=False, budget=None):
+    evaluator = LazyEvaluator(trace, budget)
+    result = evaluator.normal_form(expr)
+    if trace:
+        print(f"\nCall-by-need: {evaluator.beta_steps} beta reductions, "
+              f"{evaluator.thunks_forced} arguments evaluated, "
+              f"{evaluator.thunks_shared} shared values reused")
+    while True:
+        reduced, changed = eta_reduce(result, trace)
+        if not changed:
+            return result
+        if budget is not None:
+            budget.tick(lambda: result)
+        result = reduced
+        if trace:
+            print("\nReduced to:", result)
@@ -4,6 +4,7 @@ import ply.yacc as yacc
 import io
 import sys
 import string
+import time
 
 #############################
 # TOKENS
@@ -75,6 +76,8 @@ lexer = lex.lex()
 
 # Define the nodes for the abstract syntax tree (AST)
 class VarNode:
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -83,6 +86,8 @@ class VarNode:
 
 
 class ArgNode:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -92,6 +97,8 @@ class ArgNode:
 
 # Function Application
 class AppNode:
+    __slots__ = ('func', 'arg')
+
     def __init__(self, func, arg):
         self.func = func
         self.arg = arg
@@ -102,6 +109,8 @@ class AppNode:
 
 # Function Abstraction
 class AbsNode:
+    __slots__ = ('var', 'body')
+
     def __init__(self, var, body):
         self.var = var
         self.body = body
@@ -300,15 +309,149 @@ def beta_reduce(expr):
 
 
 # Function to check for eta reduction
-def eta_reduce(expr):
+def eta_reduce(expr, trace=True):
     if isinstance(expr, AbsNode) and isinstance(expr.body, AppNode):
         if isinstance(expr.body.arg, VarNode) and expr.body.arg.name == expr.var:
             if expr.var not in free_vars(expr.body.func):
-                print(f"\nEta Reduction: Reducing {expr}")
+                if trace:
+                    print(f"\nEta Reduction: Reducing {expr}")
                 return expr.body.func, True
     return expr, False
 
 
+# Context frames used by normalize to remember the path from the root to the
+# subterm currently being reduced
+FRAME_FUNC = 'func'  # in the function position of an application, holds the argument
+FRAME_ARG = 'arg'  # in the argument position of an application, holds the function
+FRAME_BODY = 'body'  # in the body of an abstraction, holds the bound variable
+
+
+# Function to rebuild the whole expression from the focused subterm and its context
+def plug(focus, stack):
+    for kind, original, other in reversed(stack):
+        if kind == FRAME_FUNC:
+            focus = AppNode(focus, other)
+        elif kind == FRAME_ARG:
+            focus = AppNode(other, focus)
+        else:
+            focus = AbsNode(other, focus)
+    return focus
+
+
+# Function to reduce an expression to its normal form in a single traversal.
+# It contracts the same leftmost-outermost redexes as repeatedly calling
+# beta_reduce from the root, but continues from the position of the last
+# contraction instead of searching the whole expression again.
+def normalize(expr, trace=False, budget=None):
+    stack = []  # (frame kind, original node, other child or bound variable)
+    focus = expr
+
+    # Builds the partial result if the budget runs out
+    def current():
+        return plug(focus, stack)
+
+    if budget is not None and budget.limits.max_size is not None:
+        budget.resize(term_size(expr), current)
+
+    while True:
+        if isinstance(focus, AppNode) and isinstance(focus.func, AbsNode):
+            if budget is not None:
+                budget.step(current)
+                if budget.limits.max_size is not None:
+                    budget.resize(contraction_growth(focus), current)
+            if trace:
+                print(f"\nBeta Reduction: Applying {focus.arg} to {focus.func}")
+            focus = substitute(focus.func.var, focus.func.body, focus.arg)
+            if trace:
+                print("\nReduced to:", plug(focus, stack))
+
+            # The contractum can only create a new redex with its parent application
+            if isinstance(focus, AbsNode) and stack and stack[-1][0] == FRAME_FUNC:
+                _, original, arg = stack.pop()
+                focus = AppNode(focus, arg)
+            continue
+
+        if isinstance(focus, AppNode):
+            stack.append((FRAME_FUNC, focus, focus.arg))
+            focus = focus.func
+            continue
+
+        if isinstance(focus, AbsNode):
+            stack.append((FRAME_BODY, focus, focus.var))
+            focus = focus.body
+            continue
+
+        if not isinstance(focus, (VarNode, ArgNode)):
+            raise TypeError(f"\nUnexpected expression type: {type(focus)}")
+
+        # The focus is in normal form, climb back up until there is an argument left to reduce
+        while stack:
+            kind, original, other = stack.pop()
+            if kind == FRAME_FUNC:
+                stack.append((FRAME_ARG, original, focus))
+                focus = other
+                break
+            elif kind == FRAME_ARG:
+                if other is original.func and focus is original.arg:
+                    focus = original
+                else:
+                    focus = AppNode(other, focus)
+            else:
+                focus = original if focus is original.body else AbsNode(other, focus)
+        else:
+            # Beta normal form reached, try eta reduction on the whole expression
+            reduced, changed = eta_reduce(focus, trace)
+            if not changed:
+                return focus
+            if budget is not None:
+                budget.tick(current)
+                budget.size -= 3  # the abstraction, the application and the variable
+            focus = reduced
+            if trace:
+                print("\nReduced to:", focus)
+
+
+# Function to count the nodes of an expression
+def term_size(expr):
+    size = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        size += 1
+        if isinstance(node, AppNode):
+            stack.append(node.arg)
+            stack.append(node.func)
+        elif isinstance(node, AbsNode):
+            stack.append(node.body)
+    return size
+
+
+# Function to count the occurrences of a variable that a substitution would replace
+def count_free_occurrences(var, expr):
+    count = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, VarNode):
+            if node.name == var:
+                count += 1
+        elif isinstance(node, AppNode):
+            stack.append(node.arg)
+            stack.append(node.func)
+        elif isinstance(node, AbsNode) and node.var != var:
+            stack.append(node.body)
+    return count
+
+
+# Function to compute how many nodes contracting a redex adds to the expression.
+# The application, the abstraction and the argument disappear, and every
+# occurrence of the bound variable is replaced by a copy of the argument.
+def contraction_growth(redex):
+    occurrences = count_free_occurrences(redex.func.var, redex.func.body)
+    arg_size = term_size(redex.arg)
+    return (occurrences - 1) * arg_size - occurrences - 2
+
+
 # Function to count the number of bound variables
 def count_bound_vars(expr):
     return len(bound_vars(expr))
@@ -345,12 +488,110 @@ def parse_tree_str(node):
         raise TypeError(f"Unexpected node type: {type(node)}")
 
 
+#############################
+# GOVERNED EVALUATION
+#############################
+
+# Evaluation modes accepted by evaluate and main
+MODE_NORMAL = 'normal'  # normal-order reduction by substitution
+MODE_NEED = 'need'  # call-by-need evaluation with shared argument thunks
+MODES = (MODE_NORMAL, MODE_NEED)
+
+
+# Resource limits for a single evaluation, None leaves a resource unlimited
+class Limits:
+    def __init__(self, max_steps=None, max_size=None, timeout=None):
+        self.max_steps = max_steps  # beta reductions
+        self.max_size = max_size  # nodes in the expression being reduced
+        self.timeout = timeout  # seconds
+
+    def __repr__(self):
+        return f'Limits(max_steps={self.max_steps}, max_size={self.max_size}, timeout={self.timeout})'
+
+
+# Reasons for running out of budget
+LIMIT_STEPS = 'max_steps'
+LIMIT_SIZE = 'max_size'
+LIMIT_TIME = 'timeout'
+
+
+# Raised when an evaluation uses up one of its limits, holds the last complete term
+class BudgetExhausted(Exception):
+    def __init__(self, reason, term, steps):
+        super().__init__(f"{reason} limit reached after {steps} beta reductions")
+        self.reason = reason
+        self.term = term
+        self.steps = steps
+
+
+# Resources used so far by one evaluation. The partial argument of each check is
+# a function that builds the current term, it is only called when the budget runs out.
+class Budget:
+    def __init__(self, limits):
+        self.limits = limits
+        self.steps = 0
+        self.size = 0
+        self.deadline = None if limits.timeout is None else time.monotonic() + limits.timeout
+
+    # Function to account for one beta reduction before it is performed
+    def step(self, partial):
+        if self.limits.max_steps is not None and self.steps >= self.limits.max_steps:
+            raise BudgetExhausted(LIMIT_STEPS, partial(), self.steps)
+        self.tick(partial)
+        self.steps += 1
+
+    # Function to check the deadline
+    def tick(self, partial):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExhausted(LIMIT_TIME, partial(), self.steps)
+
+    # Function to account for nodes added to (or removed from) the expression
+    def resize(self, delta, partial):
+        if self.limits.max_size is not None and self.size + delta > self.limits.max_size:
+            raise BudgetExhausted(LIMIT_SIZE, partial(), self.steps)
+        self.size += delta
+
+
+# Evaluation results
+STATUS_NORMAL_FORM = 'normal_form'
+STATUS_EXHAUSTED = 'budget_exhausted'
+
+
+# Result of a governed evaluation, term is the partial result when the budget ran out
+class Outcome:
+    def __init__(self, status, term, steps, reason=None):
+        self.status = status
+        self.term = term
+        self.steps = steps
+        self.reason = reason
+
+    def __repr__(self):
+        return f'Outcome({self.status}, {self.term}, steps={self.steps}, reason={self.reason})'
+
+
+# Function to reduce an expression to normal form within the given limits
+def evaluate(expr, limits=None, mode=MODE_NORMAL, trace=False):
+    if mode not in MODES:
+        raise ValueError(f"\nUnknown evaluation mode '{mode}'")
+    budget = Budget(limits if limits is not None else Limits())
+    try:
+        if mode == MODE_NEED:
+            # Imported here since project_lazy builds on this module
+            from Programming_Language_Making.project_lazy import normalize_by_need
+            term = normalize_by_need(expr, trace, budget)
+        else:
+            term = normalize(expr, trace, budget)
+    except BudgetExhausted as exhausted:
+        return Outcome(STATUS_EXHAUSTED, exhausted.term, exhausted.steps, exhausted.reason)
+    return Outcome(STATUS_NORMAL_FORM, term, budget.steps)
+
+
 #############################
 # RUN
 #############################
 
 # Main function to run the interpreter
-def main(input_code):
+def main(input_code, mode=MODE_NORMAL, limits=None):
     # Redirect stdout to capture print statements
     old_stdout = sys.stdout
     new_stdout = io.StringIO()
@@ -361,6 +602,8 @@ def main(input_code):
     try:
         if any(c.isupper() for c in input_code):  # Check for uppercase letters
             raise ValueError("\nExpression contains uppercase letters")
+        if mode not in MODES:
+            raise ValueError(f"\nUnknown evaluation mode '{mode}'")
 
         # Parse Tree Generator
         lexer.input(input_code)  # Feed the input data to the lexer
@@ -398,16 +641,13 @@ def main(input_code):
             print("\nCurried expression:", result)
 
         # Normal Form
-        while True:
-            new_result, changed = beta_reduce(result)
-            if not changed:  # If no more reductions, try eta reduction
-                new_result, changed = eta_reduce(result)
-                if not changed:
-                    break
-            result = new_result
-            print("\nReduced to:", result)
-
-        print("\nNormal form:", result)  # Print the final reduced form
+        outcome = evaluate(result, limits, mode, trace=True)
+        result = outcome.term
+        if outcome.status == STATUS_EXHAUSTED:
+            print(f"\nBudget exhausted: {outcome.reason} limit reached after {outcome.steps} beta reductions")
+            print("\nPartial result:", result)
+        else:
+            print("\nNormal form:", result)  # Print the final reduced form
     except ValueError as ve:
         print(f"\nInput error: {ve}")
     except SyntaxError as se: